@@ -1,7 +1,6 @@
 import time
 import logging
 from pathlib import Path
-from generictools.settings import SettingsManager
 
 APP_DEFINITIONS = {"app_name": "Speaker Calculator",
                    "version": "0.6.0",
@@ -64,6 +63,9 @@ DEFAULTS = {
 
 
 def singleton_settings():
+    # imported here, it brings Qt with it. Reading APP_DEFINITIONS alone,
+    # e.g. for 'main.py --help', doesn't need to load it.
+    from generictools.settings import SettingsManager
     return SettingsManager(APP_DEFINITIONS, DEFAULTS)
 
 
@@ -74,6 +74,24 @@ def calculate_coil_to_bottom_plate_clearance(x_peak: float) -> float:
     return x_peak + proposed_clearance
 
 
+def calculate_level_db(x: Any, ref: float) -> np.ndarray:
+    """
+    Calculate the level of a field quantity in dB, i.e. 20*log10(|x|/ref).
+
+    Operates in place on the single array returned by np.abs instead of
+    allocating a temporary array for each step.
+
+    :param x: Real or complex values, array-like.
+    :param ref: Reference value, in the unit of x.
+    :return: Levels in dB as a float array.
+    """
+    level = np.abs(x).astype(float, copy=False)
+    np.log10(level, out=level)
+    level -= np.log10(ref)
+    level *= 20
+    return level
+
+
 def calculate_spl(xty: Tuple[Any, Any], sd: float) -> Tuple[np.ndarray, np.ndarray]:
     """
     Calculate SPL using simplified radiation impedance * acceleration.
@@ -87,7 +105,7 @@ def calculate_spl(xty: Tuple[Any, Any], sd: float) -> Tuple[np.ndarray, np.ndarr
     # p0: acoustic pressure
     p0 = 0.5 * 1j * freqs * 2 * np.pi * air.RHO * a ** 2 * np.array(xty[1]).flatten()
     pref = 2e-5
-    spl = 20 * np.log10(np.abs(p0) / pref)
+    spl = calculate_level_db(p0, pref)
     return freqs, spl
 
 
@@ -16,12 +16,22 @@ __email__ = "kbasaran@gmail.com"
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import heapq
 import logging
+from operator import itemgetter
 from typing import Dict, Any, Optional
 
+import numpy as np
+
 import core.speaker_driver
 from .components import Wire, Coil, Motor
 
+# Most coil options offered to the user, the ones with the highest Lm are kept
+_MAX_COIL_OPTIONS = 50
+# Name of a coil option as shown to the user: coil name, Re, Lm, Qts
+_COIL_OPTION_NAME = "{} -> Re={:.2f}, Lm={:.2f}, Qts={:.2f}"
+
+
 def wind_coil(wire: Wire,
               n_layers: int,
               w_stacking_coef: float,
@@ -55,13 +65,19 @@ def wind_coil(wire: Wire,
     return Coil(carrier_od, wire, n_windings, w_stacking_coef)
 
 
-def find_feasible_coils(vals: Dict[str, Any], wires: Dict[str, Wire], logger: Optional[logging.Logger] = None) -> Dict[str, Motor]:
+def find_feasible_coils(vals: Dict[str, Any],
+                        wires: Dict[str, Wire],
+                        logger: Optional[logging.Logger] = None,
+                        keep: Optional[tuple] = None,
+                        ) -> Dict[str, Motor]:
     """
     Scan for the best matching speaker coil options based on input parameters.
 
     :param vals: Dictionary of input values (target Re, dimensions, etc.).
     :param wires: Dictionary of available wire objects.
     :param logger: Logger object for debugging (optional).
+    :param keep: (wire name, number of layers) of an option to keep even if it ranks below
+        the best options, e.g. the user's current selection (optional). It is put last.
     :return: Dictionary mapping friendly names to Motor objects.
     :raises ValueError: If the number of layer options is invalid or empty.
     """
@@ -78,23 +94,44 @@ def find_feasible_coils(vals: Dict[str, Any], wires: Dict[str, Wire], logger: Op
 
     speaker_options = []
 
+    # Wire properties as arrays, to estimate the coil Re of all wires at once
+    wire_list = list(wires.values())
+    h_avg = np.array([wire.h_avg for wire in wire_list])
+    w_avg = np.array([wire.w_avg for wire in wire_list])
+    resistance = np.array([wire.resistance for wire in wire_list])
+    carrier_od = vals["former_ID"] + 2 * vals["t_former"]
+    Re_min, Re_max = vals["target_Re"] / 1.15, vals["target_Re"] * 1.2
+
     for n_layers in layer_options:
-        for wire_name, wire in wires.items():
+        # Same arithmetic as in wind_coil and Coil, done for all wires together.
+        # Only the wires that can be wound and land in the Re window are wound for real below.
+        # The window is widened a hair here since the array sums may round differently.
+        i_layer = np.arange(n_layers)[:, np.newaxis]
+        n_windings = np.rint(vals["h_winding_target"] / h_avg - i_layer * vals["reduce_per_layer"])
+        turn_radii = carrier_od / 2 + w_avg / 2 + vals["w_stacking_coef"] * i_layer * w_avg
+        Re_estimates = resistance * np.sum(2 * np.pi * turn_radii * n_windings, axis=0)
+        is_candidate = (np.all(n_windings >= 1, axis=0)
+                        & (Re_estimates > Re_min * (1 - 1e-9))
+                        & (Re_estimates < Re_max * (1 + 1e-9))
+                        )
+
+        for i_wire in np.flatnonzero(is_candidate):
+            wire = wire_list[i_wire]
             try:
                 coil = wind_coil(
                     wire=wire,
                     n_layers=n_layers,
                     w_stacking_coef=vals["w_stacking_coef"],
-                    carrier_od=vals["former_ID"] + 2 * vals["t_former"],  # carrier_OD
+                    carrier_od=carrier_od,
                     h_winding_target=vals["h_winding_target"],
                     reduce_per_layer=vals["reduce_per_layer"],
                 )
             except ValueError as e:
-                logger.debug(f"Could not wind coil for {wire_name}: {e}")
+                logger.debug("Could not wind coil for %s: %s", wire.name, e)
                 continue
 
             # Check if Re is within +/- 15-20% of target
-            if vals["target_Re"] / 1.15 < coil.Re < vals["target_Re"] * 1.2:
+            if Re_min < coil.Re < Re_max:
                 motor = Motor(
                     coil=coil,
                     Bavg=vals["B_average"],
@@ -114,13 +151,21 @@ def find_feasible_coils(vals: Dict[str, Any], wires: Dict[str, Wire], logger: Op
                 )
                 speaker_options.append(speaker)
 
-    # Sort the viable coil options by Lm (Efficiency/Motor strength)
-    speaker_options.sort(key=lambda x: x.Lm(), reverse=True)
+    # Keep the best viable coil options by Lm (Efficiency/Motor strength), best first.
+    # Lm is calculated once per option, for the ranking and the name.
+    lm_speaker_pairs = [(speaker.Lm(), speaker) for speaker in speaker_options]
+    if len(lm_speaker_pairs) > 1:
+        best_pairs = heapq.nlargest(_MAX_COIL_OPTIONS, lm_speaker_pairs, key=itemgetter(0))
+        if keep is not None and not any(speaker.motor.coil.get_wire_name_and_layers() == keep
+                                        for _, speaker in best_pairs):
+            best_pairs += [pair for pair in lm_speaker_pairs
+                           if pair[1].motor.coil.get_wire_name_and_layers() == keep][:1]
+        lm_speaker_pairs = best_pairs
 
     name_to_motor = {}
-    for speaker in speaker_options:
-        lm = speaker.Lm()
-        name = f"{speaker.motor.coil.name} -> Re={speaker.Re:.2f}, Lm={lm:.2f}, Qts={speaker.Qts:.2f}"
-        name_to_motor[name] = speaker.motor
+    format_name = _COIL_OPTION_NAME.format
+    for lm, speaker in lm_speaker_pairs:
+        motor = speaker.motor
+        name_to_motor[format_name(motor.coil.name, speaker.Re, lm, speaker.Qts)] = motor
 
     return name_to_motor
@@ -1,3 +1,4 @@
+import dataclasses
 import logging
 
 import numpy as np
@@ -10,6 +11,11 @@ from config.physics import air
 
 logger = logging.getLogger(__name__)
 
+# Constructor arguments of the dataclasses that make up a motor
+_WIRE_FIELD_NAMES = tuple(field.name for field in dataclasses.fields(Wire) if field.init)
+_COIL_FIELD_NAMES = tuple(field.name for field in dataclasses.fields(Coil) if field.init)
+_MOTOR_FIELD_NAMES = tuple(field.name for field in dataclasses.fields(Motor) if field.init)
+
 
 def _driver_sealed_fb(speaker: SpeakerDriver, enclosure: Enclosure) -> float:
     "Driver's housed (sealed-box) resonance f_b -- matches SpeakerSystem.fb."
@@ -106,6 +112,26 @@ def construct_BassReflexPort(vals, spec: str,
     return BassReflexPort(m=m_tube, k=0.0, R=Rp, S=S, end_correction=end_correction)
 
 
+def _init_args(cls, as_dict: dict, init_field_names: tuple) -> dict:
+    "Constructor arguments of cls found in as_dict. Keys that are not fields of cls are dropped with a warning."
+    for key in sorted(as_dict.keys() - {field.name for field in dataclasses.fields(cls)}):
+        logger.warning("Ignoring unknown %s value '%s' in motor data.", cls.__name__, key)
+    return {key: as_dict[key] for key in init_field_names if key in as_dict}
+
+
+def _motor_from_dict(motor_as_dict: dict) -> Motor:
+    """Rebuild a Motor from its dataclasses.asdict form (coil options combobox data).
+
+    The given dict is not modified. Keys that are not constructor arguments are
+    ignored (unknown ones with a warning) and missing optional ones take their
+    defaults, so that data saved by other versions still loads where possible.
+    """
+    coil_as_dict = motor_as_dict["coil"]
+    wire = Wire(**_init_args(Wire, coil_as_dict["wire"], _WIRE_FIELD_NAMES))
+    coil = Coil(**_init_args(Coil, coil_as_dict, _COIL_FIELD_NAMES) | {"wire": wire})
+    return Motor(**_init_args(Motor, motor_as_dict, _MOTOR_FIELD_NAMES) | {"coil": coil})
+
+
 def construct_SpeakerDriver(vals) -> SpeakerDriver:
     "Create the loudspeaker model based on the values provided in the widget."
     motor_spec_type = vals["motor_spec_type"]["current_data"]
@@ -113,20 +139,13 @@ def construct_SpeakerDriver(vals) -> SpeakerDriver:
     if motor_spec_type == "define_coil":
         try:
             motor_as_dict = vals["coil_options"]["current_data"]
-            logger.debug(f"Motor object will be built from dict: {motor_as_dict}")
-            wire_as_dict = motor_as_dict["coil"]["wire"]
-            wire = Wire(**wire_as_dict)
+            if logger.isEnabledFor(logging.DEBUG):  # don't format the nested dict for nothing
+                logger.debug("Motor object will be built from dict: %s", motor_as_dict)
+            motor = _motor_from_dict(motor_as_dict)
 
-            coil_as_dict = motor_as_dict["coil"]
-            coil_as_dict["wire"] = wire
-            coil = Coil(**coil_as_dict)
-
-            motor_as_dict["coil"] = coil
-            motor = Motor(**motor_as_dict)
-
-        except (TypeError, AttributeError) as e:  # doesn't have motor attribute or is None
-            print(e)
-            raise RuntimeError("Invalid motor object in coil options combobox")
+        except (TypeError, AttributeError, KeyError) as e:  # doesn't have motor attribute, is None or incomplete
+            logger.exception("Could not build the motor from the coil options data.")
+            raise RuntimeError("Invalid motor object in coil options combobox") from e
         speaker_driver = SpeakerDriver(fs=vals["fs"],
                                           Sd=vals["Sd"],
                                           Qms=vals["Qms"],
@@ -170,23 +189,38 @@ def construct_SpeakerDriver(vals) -> SpeakerDriver:
     return speaker_driver
 
 
+def _reuse_or_make(current, cls, *values):
+    """current if it is a cls holding exactly values (in field order), otherwise a new cls(*values).
+
+    Enclosure and ParentBody are not modified after they are made, so the ones of
+    an existing system can be kept when an update doesn't change them.
+    """
+    if type(current) is cls and values == tuple(getattr(current, field.name) for field in dataclasses.fields(cls)):
+        return current
+    return cls(*values)
+
+
 def build_or_update_SpeakerSystem(vals,
                                   speaker: SpeakerDriver,
                                   spk_sys: None | SpeakerSystem = None,
                                   ) -> SpeakerSystem:
     if vals["enclosure_type"] in (1, 2):  # closed box or passive radiator
-        enclosure = Enclosure(vals["Vb"],
-                                 vals["Qa"],
-                                 vals["Ql"],
-                                 )
+        enclosure = _reuse_or_make(spk_sys.enclosure if spk_sys else None,
+                                   Enclosure,
+                                   vals["Vb"],
+                                   vals["Qa"],
+                                   vals["Ql"],
+                                   )
     else:
         enclosure = None
 
     if vals["parent_body"] == 1:
-        parent_body = ParentBody(vals["mpb"],
-                                    vals["kpb"],
-                                    vals["rpb"],
-                                    )
+        parent_body = _reuse_or_make(spk_sys.parent_body if spk_sys else None,
+                                     ParentBody,
+                                     vals["mpb"],
+                                     vals["kpb"],
+                                     vals["rpb"],
+                                     )
     else:
         parent_body = None
 
@@ -371,6 +371,9 @@ class SpeakerSystem:
                                                             C[[i], :],
                                                             D[[i], :],
                                                             )
+        # responses of the previous models are stale now, see _get_response
+        self._unit_responses = dict()
+        self._unit_responses_freqs = None
 
     def get_summary(self, V_source: float = 0, freqs: np.ndarray = None) -> str:
         """Summary in HTML (rendered by Qt's rich-text engine via setHtml).
@@ -496,8 +499,15 @@ class SpeakerSystem:
     def _get_response(self, output_name: str, V_source, freqs: np.ndarray) -> np.ndarray:
         # Frequency response of one output of the system to a given source voltage
         # Voltage argument given in RMS, output in the unit of the output variable, RMS
-        w = 2 * np.pi * np.array(freqs)
-        return signal.freqresp(self.ss_models[output_name], w=w)[1] * V_source
+        # Responses to 1 V are kept per output until the model values or the frequency
+        # array change, so that the different graphs and the summary share the solves.
+        if freqs is not self._unit_responses_freqs:
+            self._unit_responses = dict()
+            self._unit_responses_freqs = freqs
+        if output_name not in self._unit_responses:
+            w = 2 * np.pi * np.array(freqs)
+            self._unit_responses[output_name] = signal.freqresp(self.ss_models[output_name], w=w)[1]
+        return self._unit_responses[output_name] * V_source
 
     def get_displacements(self, V_source, freqs: np.ndarray) -> dict:
         # Voltage argument given in RMS
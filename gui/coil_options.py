@@ -1,28 +1,57 @@
 import dataclasses
 
 from PySide6 import QtWidgets as qtw
+from PySide6 import QtCore as qtc
+from PySide6 import QtGui as qtg
 
 from gui.input_section_tab_widget import InputSectionTabWidget
 
 
-def update_coil_options_combobox(combo_box: qtw.QComboBox, input_form_tabbed: InputSectionTabWidget, name_to_motor: dict):
+def _shallow_asdict(obj) -> dict:
+    return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+
+
+def _motor_as_dict(motor) -> dict:
+    """Same result as dataclasses.asdict(motor), without its generic deep copy.
+
+    The only nested dataclasses of a motor are its coil and the coil's wire, and the
+    only container is the list of windings per layer.
+    """
+    coil_dict = _shallow_asdict(motor.coil)
+    coil_dict["wire"] = _shallow_asdict(motor.coil.wire)
+    coil_dict["N_windings"] = list(motor.coil.N_windings)
+    return {**_shallow_asdict(motor), "coil": coil_dict}
+
+
+def get_selected_wire_name_and_layers(combo_box: qtw.QComboBox) -> tuple:
+    "(wire name, number of layers) of the coil selected in combo_box, (None, None) if there is none."
     try:
-        last_selected = (
+        return (
             combo_box.currentData()["coil"]["wire"]["name"],
             len(combo_box.currentData()["coil"]["N_windings"]),
             )
     except (KeyError, AttributeError, TypeError):
-        last_selected = (None, None)
+        return (None, None)
+
+
+def update_coil_options_combobox(combo_box: qtw.QComboBox, input_form_tabbed: InputSectionTabWidget, name_to_motor: dict):
+    last_selected = get_selected_wire_name_and_layers(combo_box)
 
     combo_box.clear()
 
     index_to_select = -1
-    # Add the coils to the combobox (with their userData)
+    # Items for the coils, with the motor as their userData (same as addItem would make).
+    # They are appended to the combobox's model together, so the model and the view
+    # are updated once instead of once per coil.
+    items = []
     for i, (name, motor) in enumerate(name_to_motor.items()):
-        # Make a string for the text to show on the combo box
-        combo_box.addItem(name, dataclasses.asdict(motor))
+        item = qtg.QStandardItem(name)
+        item.setData(_motor_as_dict(motor), qtc.Qt.UserRole)
+        items.append(item)
         if motor.coil.get_wire_name_and_layers() == last_selected:
             index_to_select = i
+    if items:
+        combo_box.model().invisibleRootItem().appendRows(items)
 
     combo_box.setCurrentIndex(index_to_select)
 
@@ -9,6 +9,11 @@ import generictools.personalized_widgets as pwi
 
 logger = logging.getLogger(__name__)
 
+# Row positions in the selector combo boxes, checked by the form logic slots.
+# Keep in sync with the option lists given to the combo boxes.
+_EXCITATION_WN_INDEX = 2  # "Watts @Rnom" in 'excitation_type'
+_MOTOR_DEFINE_COIL_INDEX = 0  # "Define Coil Dimensions and Average B" in 'motor_spec_type'
+
 
 class InputSectionTabWidget(qtw.QTabWidget):
     signal_good_beep = qtc.Signal()
@@ -20,19 +25,37 @@ class InputSectionTabWidget(qtw.QTabWidget):
     def __init__(self):
         super().__init__()
         self.interactable_widgets = {}
+        self._form_keys = {}  # tab index -> frozenset of value names in that tab's form, see get_form_keys
         self._add_form_tabs()
         self.setAcceptDrops(True)
 
     def _add_form_tabs(self):
-        forms = (
-            self._make_form_for_general_tab(),
-            self._make_form_for_motor_tab(),
-            self._make_form_for_enclosure_tab(),
-            self._make_form_for_system_tab(),
+        # Each tab is added as soon as it is built, so the form logic of a later tab
+        # can bind to widgets of the earlier ones (the motor tab toggles 'dead_mass').
+        form_makers = (
+            self._make_form_for_general_tab,
+            self._make_form_for_motor_tab,
+            self._make_form_for_enclosure_tab,
+            self._make_form_for_system_tab,
         )
-        for tab_name, form in zip(self.TAB_NAMES, forms, strict=True):
+        forms = []
+        for tab_name, make_form in zip(self.TAB_NAMES, form_makers, strict=True):
+            form = make_form()
             self.addTab(form, tab_name)
             self.interactable_widgets.update(form.interactable_widgets)
+            forms.append(form)
+        # the forms in tab order. tabs are not added or removed later.
+        self.forms = tuple(forms)
+
+    def get_form_keys(self, index: int) -> frozenset:
+        """Names of the values held by the form on the tab at index.
+
+        Forms don't change after construction, so the names are collected once
+        and reused by later state loads.
+        """
+        if index not in self._form_keys:
+            self._form_keys[index] = frozenset(self.forms[index].get_form_values())
+        return self._form_keys[index]
 
     def dragEnterEvent(self, event: qtg.QDragEnterEvent):
         """Accept file drag event if it contains URLs (files)."""
@@ -153,14 +176,16 @@ class InputSectionTabWidget(qtw.QTabWidget):
                      )
 
         # ---- Form logic
+        # widgets used by the slot are looked up once here, not on every signal
+        excitation_type_combobox = form.interactable_widgets["excitation_type"]
+        rnom_widget = form.interactable_widgets["Rnom"]
+
         def adjust_form_for_excitation_type(chosen_index):
-            is_Wn = \
-                form.interactable_widgets["excitation_type"].itemData(chosen_index) == "Wn"
-            form.interactable_widgets["Rnom"].setEnabled(is_Wn)
+            rnom_widget.setEnabled(chosen_index == _EXCITATION_WN_INDEX)
 
-        form.interactable_widgets["excitation_type"].currentIndexChanged.connect(adjust_form_for_excitation_type)
-        # adjustment at start
-        adjust_form_for_excitation_type(form.interactable_widgets["excitation_type"].currentIndex())
+        excitation_type_combobox.currentIndexChanged.connect(adjust_form_for_excitation_type)
+        # state at start: first excitation type (Volts) is selected, Rnom is not used
+        rnom_widget.setEnabled(False)
 
         return form
 
@@ -411,15 +436,22 @@ class InputSectionTabWidget(qtw.QTabWidget):
         # form.add_row(spacer)
 
         # ---- Form logic
+        # widgets used by the slot are looked up once here, not on every signal.
+        # 'dead_mass' is on the general tab, which is already built (see _add_form_tabs).
+        motor_spec_type_combobox = form.interactable_widgets["motor_spec_type"]
+        coil_only_widgets = (form.interactable_widgets["h_top_plate"],
+                             form.interactable_widgets["airgap_clearance_inner"],
+                             form.interactable_widgets["airgap_clearance_outer"],
+                             form.interactable_widgets["h_former_under_coil"],
+                             self.interactable_widgets["dead_mass"],
+                             )
+
         def adjust_form_for_motor_calc_type(chosen_index):
-            is_define_coil = form.interactable_widgets["motor_spec_type"].itemData(chosen_index) == "define_coil"
-            form.interactable_widgets["h_top_plate"].setEnabled(is_define_coil)
-            form.interactable_widgets["airgap_clearance_inner"].setEnabled(is_define_coil)
-            form.interactable_widgets["airgap_clearance_outer"].setEnabled(is_define_coil)
-            form.interactable_widgets["h_former_under_coil"].setEnabled(is_define_coil)
-            self.widget(0).interactable_widgets["dead_mass"].setEnabled(is_define_coil)
+            is_define_coil = chosen_index == _MOTOR_DEFINE_COIL_INDEX
+            for widget in coil_only_widgets:
+                widget.setEnabled(is_define_coil)
 
-        form.interactable_widgets["motor_spec_type"].currentIndexChanged.connect(adjust_form_for_motor_calc_type)
+        motor_spec_type_combobox.currentIndexChanged.connect(adjust_form_for_motor_calc_type)
 
         return form
 
@@ -628,21 +660,25 @@ class InputSectionTabWidget(qtw.QTabWidget):
                                   "spring_damping_ratio_pr", "area_ratio_pr", "Mmdp",  # PR page
                                   "port_diameter", "Qp", "exit_flare_type",            # bass reflex page
                                   )
+        # widgets used by the slot are looked up once here, not on every signal
+        enclosure_type_group = form.interactable_widgets["enclosure_type"]
+        box_widgets = tuple(form.interactable_widgets[key] for key in ("Vb", "Qa", "Ql"))
+        resonator_widgets = tuple(form.interactable_widgets[key] for key in resonator_widget_keys)
 
         def adjust_form_for_enclosure_type(*_):
-            enclosure_type = form.interactable_widgets["enclosure_type"].checkedId()
+            enclosure_type = enclosure_type_group.checkedId()
             has_box = enclosure_type in (1, 2)  # closed box or PR/vented
             has_resonator = enclosure_type == 2
 
-            form.interactable_widgets["Vb"].setEnabled(has_box)
-            form.interactable_widgets["Qa"].setEnabled(has_box)
-            form.interactable_widgets["Ql"].setEnabled(has_box)
-            for key in resonator_widget_keys:
-                form.interactable_widgets[key].setEnabled(has_resonator)
+            for widget in box_widgets:
+                widget.setEnabled(has_box)
+            for widget in resonator_widgets:
+                widget.setEnabled(has_resonator)
 
-        form.interactable_widgets["enclosure_type"].idToggled.connect(adjust_form_for_enclosure_type)
-        # adjustment at start
-        adjust_form_for_enclosure_type()
+        enclosure_type_group.idToggled.connect(adjust_form_for_enclosure_type)
+        # state at start: no box is selected yet, so neither the box nor the resonator inputs are used
+        for widget in box_widgets + resonator_widgets:
+            widget.setEnabled(False)
 
         return form
 
@@ -690,13 +726,16 @@ class InputSectionTabWidget(qtw.QTabWidget):
                      )
 
         # ---- Form logic
+        # widgets used by the slot are looked up once here, not on every signal
+        parent_body_widgets = tuple(form.interactable_widgets[key] for key in ("kpb", "mpb", "rpb"))
+
         def adjust_form_for_system_type(toggled_id, checked):
-            form.interactable_widgets["kpb"].setEnabled(toggled_id == 1 and checked is True)
-            form.interactable_widgets["mpb"].setEnabled(toggled_id == 1 and checked is True)
-            form.interactable_widgets["rpb"].setEnabled(toggled_id == 1 and checked is True)
+            for widget in parent_body_widgets:
+                widget.setEnabled(toggled_id == 1 and checked is True)
 
         form.interactable_widgets["parent_body"].idToggled.connect(adjust_form_for_system_type)
-        # adjustment at start
-        adjust_form_for_system_type(0, True)
+        # state at start: parent body is rigid, its inputs are not used
+        for widget in parent_body_widgets:
+            widget.setEnabled(False)
 
         return form
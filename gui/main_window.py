@@ -7,7 +7,6 @@ from pathlib import Path
 
 from PySide6 import QtWidgets as qtw
 from PySide6 import QtCore as qtc
-from PySide6 import QtGui as qtg
 
 from generictools import signal_tools
 from generictools.graphing_widget import MatplotlibWidget
@@ -23,7 +22,7 @@ from config.app_config import APP_DEFINITIONS, ABOUT_TEXT, singleton_settings
 from utils.paths import get_main_dir
 from gui.dialogs import SettingsDialog, CurveExportMenu
 from gui.help_menu import show_file_paths, show_physics_constants
-from gui.coil_options import update_coil_options_combobox
+from gui.coil_options import update_coil_options_combobox, get_selected_wire_name_and_layers
 from gui.input_section_tab_widget import InputSectionTabWidget
 from gui.plot_builders import PLOT_BUILDERS
 from gui import session_io
@@ -50,6 +49,34 @@ def _rule_under_h2(html: str) -> str:
     return re.sub(r"<h2>(.*?)</h2>", _H2_WITH_RULE, html)
 
 
+# A representative line of the results summary, sets the minimum width of its column
+_RESULTS_SAMPLE_LINE = "Bl : 5.555 Tm      Bl²/Re : 5.55 N²/W "
+
+
+# Buttons under the graph. Defined once here instead of on every window creation.
+# The ids of the graph data choices are the keys of gui.plot_builders.PLOT_BUILDERS.
+_GRAPH_DATA_CHOICES = {0: "SPL",
+                       1: "Impedance",
+                       2: "Displacements (rel.)",
+                       3: "Displacements",
+                       4: "Forces",
+                       5: "Velocities",
+                       6: "Phase",
+                       }
+_GRAPH_DATA_TOOLTIPS = {key: "/" for key in _GRAPH_DATA_CHOICES}
+
+_GRAPH_PUSHBUTTONS = {"export_curve": "Export curve",
+                      "export_json": "Export model",
+                      }
+_GRAPH_PUSHBUTTON_TOOLTIPS = {"export_curve": "Export a single curve to clipboard.",
+                              "export_json": "Export the underlying model parameters to clipboard. Export will be JSON format text.",
+                              }
+
+# App settings that change what the graph (or the summary) shows. A settings change
+# that touches none of these, e.g. the beep amplitude, needs no recalculation or redraw.
+_GRAPH_SETTINGS = ("f_min", "f_max", "calc_ppo", "graph_grids", "matplotlib_style")
+
+
 class MainWindow(qtw.QMainWindow):
     # these are signals that this object emits.
     # they will be triggered by the functions and the widgets in this object.
@@ -58,15 +85,21 @@ class MainWindow(qtw.QMainWindow):
     signal_bad_beep = qtc.Signal()
     # signal_user_settings_changed = qtc.Signal()  # settings from menu bar changed, such as graph type
 
-    def __init__(self, sound_engine, wires, user_form_dict=None, open_user_file=None):
+    def __init__(self, sound_engine, get_wires, user_form_dict=None, open_user_file=None):
         super().__init__()
-        self.wires = wires
+        self._get_wires = get_wires  # returns the wire table, loading it on first call
+        self._freqs = (None, None)  # (settings used, calculation frequencies), see _get_freqs
+        self._plot_specs = {}  # checked_id -> PlotSpec for the current model, see update_graph
+        self._plot_specs_freqs = None  # the frequency array the specs above were built on
+        self._results_html = None  # last summary put in results_textbox, see update_all_results
+        self._graph_settings = self._get_graph_settings()  # see _settings_were_updated
         self.setWindowTitle(" - ".join(
             (APP_DEFINITIONS["app_name"],
              APP_DEFINITIONS["version"])
             ))
-        self.signal_bad_beep.connect(sound_engine.bad_beep)
-        self.signal_good_beep.connect(sound_engine.good_beep)
+        # the sound engine always lives in its own thread (see main.create_sound_engine)
+        self.signal_bad_beep.connect(sound_engine.bad_beep, qtc.Qt.QueuedConnection)
+        self.signal_good_beep.connect(sound_engine.good_beep, qtc.Qt.QueuedConnection)
         self._create_menu_bar()
         self._create_widgets()
         self._place_widgets()
@@ -75,6 +108,13 @@ class MainWindow(qtw.QMainWindow):
         # self.setStatusBar(qtw.QStatusBar())
         # self.statusBar().showMessage("Starting new window..", 2000)
 
+        # Filling in the form updates the model, which winds coils in 'define_coil'
+        # mode and so reads the wire table on first use. Done once the event loop
+        # runs, the window is shown first instead of waiting for it. The window is
+        # the context, the call is dropped if it is closed before that.
+        qtc.QTimer.singleShot(0, self, lambda: self._set_initial_state(user_form_dict, open_user_file))
+
+    def _set_initial_state(self, user_form_dict=None, open_user_file=None):
         if user_form_dict:
             self.set_state(user_form_dict)
         elif open_user_file:
@@ -84,6 +124,11 @@ class MainWindow(qtw.QMainWindow):
         else:
             self._update_model_button_clicked()
 
+    @property
+    def wires(self) -> dict:
+        "Wire table. Only needed for coil winding, so loaded when that first happens."
+        return self._get_wires()
+
     def _create_menu_bar(self):
         menu_bar = self.menuBar()
 
@@ -151,39 +196,19 @@ class MainWindow(qtw.QMainWindow):
         # Graph
         self.graph = MatplotlibWidget(layout_engine="tight")
         self.graph_data_choice = pwi.ChoiceButtonGroup("graph_data_choice",
-
-                                                       {0: "SPL",
-                                                        1: "Impedance",
-                                                        2: "Displacements (rel.)",
-                                                        3: "Displacements",
-                                                        4: "Forces",
-                                                        5: "Velocities",
-                                                        6: "Phase",
-                                                        },
-
-                                                       {0: "/",
-                                                           1: "/",
-                                                           2: "/",
-                                                           3: "/",
-                                                           4: "/",
-                                                           5: "/",
-                                                           6: "/",
-                                                        },
-
+                                                       _GRAPH_DATA_CHOICES,
+                                                       _GRAPH_DATA_TOOLTIPS,
                                                        )
         self.graph_data_choice.buttons()[2].setEnabled(False)  # the relative button is disabled at start
 
-        self.graph_pushbuttons = pwi.PushButtonGroup({"export_curve": "Export curve",
-                                                      "export_json": "Export model",
-                                                      },
-                                                     {"export_curve": "Export a single curve to clipboard.",
-                                                      "export_json": "Export the underlying model parameters to clipboard. Export will be JSON format text.",
-                                                      },
+        self.graph_pushbuttons = pwi.PushButtonGroup(_GRAPH_PUSHBUTTONS,
+                                                     _GRAPH_PUSHBUTTON_TOOLTIPS,
                                                      )
 
         # Make buttons under the graph larger
+        # the buttons share the group's font, so measure it once for all of them
+        text_height = self.graph_pushbuttons.fontMetrics().capHeight()
         for button in self.graph_pushbuttons.buttons().values():
-            text_height = qtg.QFontMetrics(button.font()).capHeight()
             button.setMinimumHeight(text_height * 5)
 
     def _place_widgets(self):
@@ -196,9 +221,10 @@ class MainWindow(qtw.QMainWindow):
         lh_boxlayout = qtw.QVBoxLayout()
         mw_center_layout.addLayout(lh_boxlayout)
 
-        text_height = qtg.QFontMetrics(self.notes_textbox.font()).capHeight()
-        text_width = qtg.QFontMetrics(self.notes_textbox.font()).averageCharWidth()
-
+        # the widget keeps metrics for its own font, no need to build new ones
+        font_metrics = self.notes_textbox.fontMetrics()
+        text_height = font_metrics.capHeight()
+        text_width = font_metrics.averageCharWidth()
 
         lh_boxlayout.addWidget(self.input_form)
         self.input_form.setSizePolicy(
@@ -249,9 +275,7 @@ class MainWindow(qtw.QMainWindow):
         # it never demands width from its content -- this minimum is what keeps the
         # panel wide enough. Pad for the frame border, the document margin and the
         # vertical scrollbar so the sample line still fits without wrapping.
-        expected_text_width = qtg.QFontMetrics(
-            self.results_textbox.font()).horizontalAdvance(
-                "Bl : 5.555 Tm      Bl²/Re : 5.55 N²/W ")
+        expected_text_width = self.results_textbox.fontMetrics().horizontalAdvance(_RESULTS_SAMPLE_LINE)
         chrome_width = (2 * self.results_textbox.frameWidth()
                         + 2 * int(self.results_textbox.document().documentMargin())
                         + self.results_textbox.style().pixelMetric(
@@ -277,9 +301,7 @@ class MainWindow(qtw.QMainWindow):
         self.input_form.interactable_widgets["update_coil_choices"]\
             .clicked.connect(self.update_coil_choices_button_clicked)
         self.update_button.clicked.connect(self._update_model_button_clicked)
-        for button in self.graph_data_choice.buttons():
-            button_id = self.graph_data_choice.button_group.id(button)
-            button.pressed.connect(lambda arg1=button_id: self.update_graph(arg1))
+        self.graph_data_choice.button_group.idPressed.connect(self.update_graph)
         self.graph_pushbuttons.buttons()["export_curve_pushbutton"].clicked.connect(self._export_curve_clicked)
         self.graph_pushbuttons.buttons()["export_json_pushbutton"].clicked.connect(self._export_model_clicked)
 
@@ -308,8 +330,20 @@ class MainWindow(qtw.QMainWindow):
         if state is None:
             state = self.get_state()
 
-        session_io.write_state_file(file, state)
-        self.signal_good_beep.emit()
+        # written on a pool thread, the beep or the error comes when it is done
+        session_io.start_writing_state_file(file, state,
+                                            on_finished=self.signal_good_beep.emit,
+                                            on_failed=self._state_file_write_failed,
+                                            )
+
+    def _state_file_write_failed(self, error: Exception):
+        # raise here in the GUI thread so the error handler reports it
+        raise error
+
+    def closeEvent(self, event):
+        # a save still running reports back to this window, which is deleted once closed
+        session_io.wait_for_state_file_writes()
+        super().closeEvent(event)
 
     @qtc.Slot(str)
     def load_state_from_file(self, file_arg: (Path | str) = None, update_last_used_folder=True):
@@ -352,15 +386,22 @@ class MainWindow(qtw.QMainWindow):
     #     if return_value:
     #         pass
 
+    def _get_graph_settings(self) -> tuple:
+        return tuple(app_settings.get_value(key) for key in _GRAPH_SETTINGS)
+
     def _settings_were_updated(self):
-        # A settings change may alter the frequency range/resolution (f_min, f_max,
-        # calc_ppo), so recompute the curves over the new range when a model exists.
-        # update_all_results -> update_graph -> update_figure(recalculate_limits=True)
-        # also refreshes the x-axis limits. Fall back to a light redraw otherwise.
-        if hasattr(self, "speaker_model_state"):
-            self.update_all_results()
-        else:
-            self.graph.update_figure(recalculate_limits=False)
+        # Nothing to redraw when none of the settings used by the graph changed
+        graph_settings = self._get_graph_settings()
+        if graph_settings != self._graph_settings:
+            self._graph_settings = graph_settings
+            # A settings change may alter the frequency range/resolution (f_min, f_max,
+            # calc_ppo), so recompute the curves over the new range when a model exists.
+            # update_all_results -> update_graph -> update_figure(recalculate_limits=True)
+            # also refreshes the x-axis limits. Fall back to a light redraw otherwise.
+            if hasattr(self, "speaker_model_state"):
+                self.update_all_results()
+            else:
+                self.graph.update_figure(recalculate_limits=False)
         self.signal_good_beep.emit()
 
     def open_about_menu(self):
@@ -375,26 +416,41 @@ class MainWindow(qtw.QMainWindow):
         message_box.exec()
 
     def update_coil_choices_button_clicked(self):
-        name_to_motor = find_feasible_coils(self.get_state(), self.wires, logger)
-        update_coil_options_combobox(self.input_form.interactable_widgets["coil_options"], self.input_form, name_to_motor)
+        coil_options = self.input_form.interactable_widgets["coil_options"]
+        # the selected coil stays on the list even if it is no longer among the best ones
+        name_to_motor = find_feasible_coils(self.get_state(), self.wires, logger,
+                                            keep=get_selected_wire_name_and_layers(coil_options))
+        update_coil_options_combobox(coil_options, self.input_form, name_to_motor)
         if self.input_form.interactable_widgets["coil_options"].currentData():
             self.signal_good_beep.emit()
 
 
     def _update_model_button_clicked(self):
         self.results_textbox.clear()
+        self._results_html = None
 
-        if self.input_form.interactable_widgets["motor_spec_type"].currentData() == "define_coil":
-            update_coil_options_combobox(self.input_form.interactable_widgets["coil_options"],
+        vals = self.get_state()
+        if hasattr(self, "speaker_model_state") and vals == self.speaker_model_state["vals"]:
+            # form not changed since the last update (e.g. button clicked twice),
+            # the coil options and the model are still valid, only the results
+            # need to be shown again
+            self.update_all_results()
+            self.signal_good_beep.emit()
+            return
+
+        if vals["motor_spec_type"]["current_data"] == "define_coil":
+            coil_options = self.input_form.interactable_widgets["coil_options"]
+            update_coil_options_combobox(coil_options,
                                          self.input_form,
-                                         find_feasible_coils(self.get_state(), self.wires, logger),
+                                         find_feasible_coils(vals, self.wires, logger,
+                                                             keep=get_selected_wire_name_and_layers(coil_options)),
                                          )
-            if not self.input_form.interactable_widgets["coil_options"].currentData():
+            if not coil_options.currentData():
                 self.results_textbox.setHtml("<h3>No coil found.</h3><p>Please check your input form.</p>")
                 self.signal_bad_beep.emit()
                 return
+            vals = self.get_state()  # with the coil selected from the new options
 
-        vals = self.get_state()
         speaker_driver = construct_SpeakerDriver(vals)
         spk_sys = self.speaker_model_state["system"] if hasattr(self, "speaker_model_state") else None
         try:
@@ -403,7 +459,12 @@ class MainWindow(qtw.QMainWindow):
             # An infeasible resonator (e.g. a bass-reflex vent that is over-tuned and
             # would need a non-positive port length) makes the model unbuildable, the
             # same way an infeasible coil-winding target does above. Report and abort
-            # the update, leaving any previous model untouched.
+            # the update. The previous system may have been partly updated already,
+            # so it is dropped together with what was derived from it.
+            if hasattr(self, "speaker_model_state"):
+                del self.speaker_model_state
+            self._plot_specs = {}
+            self.graph.clear_graph()
             self.results_textbox.setHtml(f"<h3>Model update failed.</h3><p>{html.escape(str(e))}</p>")
             self.signal_bad_beep.emit()
             return
@@ -418,6 +479,7 @@ class MainWindow(qtw.QMainWindow):
                                     "system": speaker_system,
                                     "V_source": V_source,
                                     }
+        self._plot_specs = {}  # built for the previous model
 
         self.update_all_results()
         self.signal_good_beep.emit()
@@ -443,6 +505,23 @@ class MainWindow(qtw.QMainWindow):
             pyperclip.copy(json.dumps(dataclasses.asdict(model), indent=4))
             self.signal_good_beep.emit()
 
+    def _get_freqs(self):
+        """Frequencies to calculate the curves and the summary at.
+
+        Generated from the range and resolution in the app settings. Kept
+        together with the settings they were made from and only generated again
+        when those differ, e.g. after a change in the settings dialog.
+        """
+        key = (app_settings.get_value("f_min"),
+               app_settings.get_value("f_max"),
+               app_settings.get_value("calc_ppo"),
+               )
+        freqs_key, freqs = self._freqs
+        if key != freqs_key:
+            freqs = signal_tools.generate_log_spaced_freq_list(*key)
+            self._freqs = (key, freqs)
+        return freqs
+
     def update_graph(self, checked_id):
         self.graph.clear_graph()
 
@@ -452,18 +531,24 @@ class MainWindow(qtw.QMainWindow):
 
         spk_sys, V_source = self.speaker_model_state["system"], self.speaker_model_state["V_source"]
 
-        freqs = signal_tools.generate_log_spaced_freq_list(app_settings.get_value("f_min"),
-                                                           app_settings.get_value("f_max"),
-                                                           app_settings.get_value("calc_ppo"))
-        V_spk = V_source / spk_sys.R_sys * spk_sys.speaker.Re
-        W_spk = V_spk**2 / spk_sys.speaker.Re
-
-        try:
-            builder = PLOT_BUILDERS[checked_id]
-        except KeyError:
-            raise ValueError(f"Checked id not recognized: {type(checked_id), checked_id}")
-
-        spec = builder(spk_sys, freqs, V_source, V_spk, W_spk)
+        freqs = self._get_freqs()
+        if freqs is not self._plot_specs_freqs:
+            self._plot_specs = {}
+            self._plot_specs_freqs = freqs
+
+        # switching back to a graph that was already shown for this model
+        # doesn't need the curves calculated again
+        spec = self._plot_specs.get(checked_id)
+        if spec is None:
+            try:
+                builder = PLOT_BUILDERS[checked_id]
+            except KeyError:
+                raise ValueError(f"Checked id not recognized: {type(checked_id), checked_id}")
+
+            V_spk = V_source / spk_sys.R_sys * spk_sys.speaker.Re
+            W_spk = V_spk**2 / spk_sys.speaker.Re
+            spec = builder(spk_sys, freqs, V_source, V_spk, W_spk)
+            self._plot_specs[checked_id] = spec
 
         self.graph.set_y_limits_policy(spec.ylimits_policy)
         self.graph.set_title(spec.title)
@@ -481,9 +566,13 @@ class MainWindow(qtw.QMainWindow):
         self.update_graph(checked_id)
         # The sweep-based summary checks (port chuffing velocity, PR excursion) need
         # a frequency array; reuse the same range/resolution as the graph.
-        freqs = signal_tools.generate_log_spaced_freq_list(app_settings.get_value("f_min"),
-                                                           app_settings.get_value("f_max"),
-                                                           app_settings.get_value("calc_ppo"))
+        freqs = self._get_freqs()
         summary_all = self.speaker_model_state["system"].get_summary(
             self.speaker_model_state["V_source"], freqs)
-        self.results_textbox.setHtml(_rule_under_h2(summary_all))
+        # Setting the html makes Qt parse and lay out the whole document again,
+        # skip it when the summary didn't change (e.g. a settings change that
+        # only affects the graph)
+        results_html = _rule_under_h2(summary_all)
+        if results_html != self._results_html:
+            self.results_textbox.setHtml(results_html)
+            self._results_html = results_html
@@ -13,7 +13,7 @@ from dataclasses import dataclass, field
 
 import numpy as np
 
-from core.calculations import calculate_spl
+from core.calculations import calculate_spl, calculate_level_db
 from core.components import BassReflexPort
 
 
@@ -35,6 +35,20 @@ def _dotted_for_peak(curve_names) -> dict[str, dict]:
     return {name: {"linestyle": ":"} for name in curve_names if "peak" in name.lower()}
 
 
+def _abs_curves(curves: dict, scale: float = 1) -> dict[str, np.ndarray]:
+    """Magnitudes of complex curves, multiplied by scale.
+
+    The curves are stacked into one 2-D array so that abs and the scaling run
+    once over all of them instead of once per curve.
+    """
+    if not curves:
+        return {}
+    magnitudes = np.abs(np.stack(list(curves.values())))
+    if scale != 1:
+        magnitudes *= scale
+    return dict(zip(curves.keys(), magnitudes))
+
+
 def _voltage_line(spk_sys, V_source, V_spk, W_spk) -> str:
     """Second title line describing the excitation voltage.
 
@@ -50,9 +64,11 @@ def build_spl(spk_sys, freqs, V_source, V_spk, W_spk) -> PlotSpec:
     curves = {}
 
     if spk_sys.speaker.Sd == 0:  # shaker or other with no diaphragm
-        accs = spk_sys.get_accelerations(V_source, freqs)
-        curves.update({key.replace("Diaphragm", "Moving mass"): 20*np.log10(np.abs(acc)/1e-6)
-                       for key, acc in accs.items() if "relative" not in key})
+        accs = {key.replace("Diaphragm", "Moving mass"): acc
+                for key, acc in spk_sys.get_accelerations(V_source, freqs).items()
+                if "relative" not in key}
+        # levels of all curves in one go, rows of the stacked array
+        curves.update(zip(accs.keys(), calculate_level_db(np.stack(list(accs.values())), 1e-6)))
         title = f"Acceleration, \n{_voltage_line(spk_sys, V_source, V_spk, W_spk)}"
         ylabel = r"dB ref. $\mathregular{10^{-6}}$m/s²"
 
@@ -93,7 +109,7 @@ def build_impedance(spk_sys, freqs, V_source, V_spk, W_spk) -> PlotSpec:
     # Plot the impedance magnitude |Z| (what impedance analyzers measure and what
     # sets the amplifier load I = V/|Z|), not the real part. No voice-coil
     # inductance is modelled, so |Z| stays flat at high frequency.
-    curves = {key: np.abs(val) for key, val in spk_sys.get_Z(freqs).items()}
+    curves = _abs_curves(spk_sys.get_Z(freqs))
     return PlotSpec(curves,
                     title="Electrical impedance magnitude |Z| (no inductance)",
                     ylabel="ohm",
@@ -102,9 +118,10 @@ def build_impedance(spk_sys, freqs, V_source, V_spk, W_spk) -> PlotSpec:
 
 
 def build_relative_displacements(spk_sys, freqs, V_source, V_spk, W_spk) -> PlotSpec:
-    curves = {key: np.abs(val) * 1e3
-              for key, val in spk_sys.get_displacements(V_source, freqs).items()
-              if "relative" in key}
+    curves = _abs_curves({key: val
+                          for key, val in spk_sys.get_displacements(V_source, freqs).items()
+                          if "relative" in key},
+                         scale=1e3)
     return PlotSpec(curves,
                     title=f"Displacements - relative to parent body\n{_voltage_line(spk_sys, V_source, V_spk, W_spk)}",
                     ylabel="mm",
@@ -113,9 +130,10 @@ def build_relative_displacements(spk_sys, freqs, V_source, V_spk, W_spk) -> Plot
 
 
 def build_displacements(spk_sys, freqs, V_source, V_spk, W_spk) -> PlotSpec:
-    curves = {key: np.abs(val) * 1e3
-              for key, val in spk_sys.get_displacements(V_source, freqs).items()
-              if "relative" not in key}
+    curves = _abs_curves({key: val
+                          for key, val in spk_sys.get_displacements(V_source, freqs).items()
+                          if "relative" not in key},
+                         scale=1e3)
     if isinstance(spk_sys.passive_radiator, BassReflexPort):
         curves = {key: val for key, val in curves.items() if "vent" not in key.lower()}
     return PlotSpec(curves,
@@ -126,7 +144,7 @@ def build_displacements(spk_sys, freqs, V_source, V_spk, W_spk) -> PlotSpec:
 
 
 def build_forces(spk_sys, freqs, V_source, V_spk, W_spk) -> PlotSpec:
-    curves = {key: np.abs(val) for key, val in spk_sys.get_forces(V_source, freqs).items()}
+    curves = _abs_curves(spk_sys.get_forces(V_source, freqs))
     return PlotSpec(curves,
                     title=f"Forces\n{_voltage_line(spk_sys, V_source, V_spk, W_spk)}",
                     ylabel="N",
@@ -134,7 +152,7 @@ def build_forces(spk_sys, freqs, V_source, V_spk, W_spk) -> PlotSpec:
 
 
 def build_velocities(spk_sys, freqs, V_source, V_spk, W_spk) -> PlotSpec:
-    curves = {key: np.abs(val) for key, val in spk_sys.get_velocities(V_source, freqs).items()}
+    curves = _abs_curves(spk_sys.get_velocities(V_source, freqs))
     return PlotSpec(curves,
                     title=f"Velocities\n{_voltage_line(spk_sys, V_source, V_spk, W_spk)}",
                     ylabel="m/s",
@@ -151,7 +169,7 @@ def build_phase(spk_sys, freqs, *args) -> PlotSpec:
 
 
 # Maps graph_data_choice button id -> builder. Keep in sync with the choices
-# defined in MainWindow._create_widgets (graph_data_choice).
+# defined in gui.main_window._GRAPH_DATA_CHOICES.
 PLOT_BUILDERS = {
     0: build_spl,
     1: build_impedance,
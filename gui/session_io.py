@@ -6,28 +6,34 @@ model recalculation - those side effects stay with the caller so this module
 stays a pure serialization/IO boundary.
 """
 
-import json
 import logging
 from pathlib import Path
 
 from PySide6 import QtWidgets as qtw
+from PySide6 import QtCore as qtc
 
 from config.app_config import APP_DEFINITIONS
 from utils.version_convert import convert_any
+from utils import json_io
 
 logger = logging.getLogger(__name__)
 
 FILE_FILTER = "Speaker calculator files (*.sscf)"
 FILE_SUFFIX = ".sscf"
 
+# state files are written on a pool of their own, so that waiting for them does not
+# also wait for unrelated work on the global pool. One thread keeps the writes in the
+# order of the saves, a later save of the same file can't be overwritten by an earlier one.
+_state_file_pool = qtc.QThreadPool()
+_state_file_pool.setMaxThreadCount(1)
+
 
 def collect_state(input_form, title_textbox, notes_textbox) -> dict:
     """Read the full user-form state into a serializable dict."""
     logger.debug("Get states initiated.")
     state = {}
-    tab_widgets = [input_form.widget(i) for i in range(input_form.count())]
-    for input_form_widget in tab_widgets:
-        state = {**state, **input_form_widget.get_form_values()}
+    for form in input_form.forms:
+        state.update(form.get_form_values())
 
     state["user_notes"] = notes_textbox.toPlainText()
     state["user_title"] = title_textbox.text()
@@ -38,14 +44,18 @@ def collect_state(input_form, title_textbox, notes_textbox) -> dict:
 def apply_state(input_form, title_textbox, notes_textbox, state: dict) -> None:
     """Write a state dict back into the form widgets. Does not recalculate."""
     logger.debug("Set states initiated.")
-    tab_widgets = [input_form.widget(i) for i in range(input_form.count())]
-    for input_form_widget in tab_widgets:
-        # for each form on its corresponding tab, make a "relevant states" dictionary
-        # this dictionary will not contain all the settings
-        # but only the ones that have items with matching names to form's items (names in form_object_names)
-        form_object_names = [name for name in input_form_widget.get_form_values().keys()]
-        relevant_states = {key: val for (key, val) in state.items() if key in form_object_names}
-        input_form_widget.update_complete_form(relevant_states)
+    # give each form the values with names matching its items (form keys), in a
+    # single pass over the state. Values that no form owns are left out.
+    form_keys = [input_form.get_form_keys(i) for i in range(len(input_form.forms))]
+    relevant_states = [{} for _ in input_form.forms]
+    for key, val in state.items():
+        for keys, relevant_state in zip(form_keys, relevant_states):
+            if key in keys:
+                relevant_state[key] = val
+                break
+
+    for form, relevant_state in zip(input_form.forms, relevant_states):
+        form.update_complete_form(relevant_state)
 
     notes_textbox.setPlainText(state.get("user_notes", "Error: NA"))
     title_textbox.setText(state.get("user_title", "Error: NA"))
@@ -57,21 +67,18 @@ def prompt_save_path(parent, start_dir: str) -> Path | None:
                                                       dir=start_dir,
                                                       filter=FILE_FILTER,
                                                       )
-    try:
-        file_raw = path_unverified[0]
-        if file_raw:
-            file = Path(file_raw)
-            if file.suffix != FILE_SUFFIX:
-                file = file.with_suffix(FILE_SUFFIX)
-            # filter not working as expected, saves files without file extension scf
-            # therefore above logic
-            assert file.parent.exists()
-        else:
-            return None  # empty file_raw. means nothing was selected, so pick file is canceled.
-    except:
-        # Path object could not be created
-        raise NotADirectoryError(file_raw)
-
+    file_raw = path_unverified[0]
+    if not file_raw:
+        return None  # empty file_raw. means nothing was selected, so pick file is canceled.
+
+    file = Path(file_raw)
+    # suffix compared case-insensitive, so "model.SSCF" is kept as it is
+    if file.suffix.lower() != FILE_SUFFIX:
+        file = file.with_suffix(FILE_SUFFIX)
+    # filter not working as expected, saves files without file extension scf
+    # therefore above logic
+    # the dialog only offers existing folders, a folder that is gone by the time
+    # of writing shows up as an error from the write itself
     return file
 
 
@@ -79,9 +86,63 @@ def write_state_file(file: Path, state: dict) -> None:
     """Serialize a state dict to the given .sscf file."""
     state["application_data"] = APP_DEFINITIONS
 
-    json_string = json.dumps(state, indent=4)
-    with open(file, "wt") as f:
-        f.write(json_string)
+    file.write_bytes(json_io.dumps(state))
+
+
+class StateFileWriterSignals(qtc.QObject):
+    finished = qtc.Signal()
+    failed = qtc.Signal(object)  # the exception that stopped the write
+
+
+class StateFileWriter(qtc.QRunnable):
+    """Run write_state_file on a thread pool thread, see start_writing_state_file.
+
+    A QRunnable can't have signals itself, so they are on a separate QObject.
+    It is made a child of the application, not of the window that saves: a window
+    closed during the write would take the signals with it while the pool thread
+    still emits them. The signals object is deleted after one of them arrives.
+    """
+
+    def __init__(self, file: Path, state: dict):
+        super().__init__()
+        self.file = file
+        self.state = state
+        self.signals = StateFileWriterSignals(qtc.QCoreApplication.instance())
+
+    def run(self):
+        try:
+            write_state_file(self.file, self.state)
+        except Exception as e:
+            # an exception can't leave a pool thread, hand it over to the caller
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit()
+
+
+def start_writing_state_file(file: Path, state: dict, on_finished, on_failed) -> None:
+    """Serialize and write a state dict in the background, without blocking the GUI.
+
+    on_finished is called without arguments after a successful write, on_failed with
+    the exception otherwise, both in the GUI thread. The state dict should not
+    be modified by the caller after this call.
+    """
+    writer = StateFileWriter(file, state)
+    # connect before starting, a quick write could emit before the connections exist
+    writer.signals.finished.connect(on_finished)
+    writer.signals.failed.connect(on_failed)
+    for signal in (writer.signals.finished, writer.signals.failed):
+        signal.connect(writer.signals.deleteLater)
+    _state_file_pool.start(writer)
+
+
+def wait_for_state_file_writes() -> None:
+    """Block until the state files being written are done.
+
+    Only the state file writes are waited for, not other background work. Their
+    finished/failed signals are then already queued, so a window that calls this
+    before it goes away still receives them.
+    """
+    _state_file_pool.waitForDone()
 
 
 def prompt_load_path(parent, start_dir: str) -> Path | None:
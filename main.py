@@ -18,21 +18,24 @@ __email__ = "kbasaran@gmail.com"
 
 import sys
 import time
-
-from PySide6 import QtWidgets as qtw
-from PySide6 import QtCore as qtc
-from PySide6 import QtGui as qtg
-
-import generictools.personalized_widgets as pwi
+import atexit
+import functools
+import queue
 
 import logging
+import logging.handlers
 from pathlib import Path
 
-import utils.file_io as fio
 from utils.paths import get_main_dir
+from utils.log_handlers import BufferedFileHandler
+
+from config.app_config import APP_DEFINITIONS
 
-from config.app_config import APP_DEFINITIONS, singleton_settings
-from gui.main_window import MainWindow
+logger = logging.getLogger(__name__)
+
+# Qt, the widgets, the GUI and the wire table reader are imported inside the
+# functions that use them, so that '--help' and argument errors don't wait for
+# them to load.
 
 
 def parse_args(APP_DEFINITIONS):
@@ -54,11 +57,39 @@ def parse_args(APP_DEFINITIONS):
     parser.add_argument('-d', '--loglevel', nargs="?",
                         choices=["debug", "info", "warning", "error", "critical"],
                         help="Set logging level for Python logging. Valid values are debug, info, warning, error and critical.")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Print how long each phase of the startup took, before the first window is used."
+                        " For the time spent importing modules also use 'python -X importtime'.")
 
     return parser.parse_args()
 
 
+class StartupTimer:
+    "Durations of the startup phases, for '--profile-startup'."
+
+    def __init__(self):
+        self.phases = []  # (phase name, duration in seconds)
+        self._last_mark = time.perf_counter()
+
+    def mark(self, phase_name: str):
+        "Record the time since the previous mark as the duration of phase_name."
+        now = time.perf_counter()
+        self.phases.append((phase_name, now - self._last_mark))
+        self._last_mark = now
+
+    def report(self) -> str:
+        "Table of the phases, slowest first."
+        lines = [f"{'Startup phase':<20}{'Time [ms]':>12}"]
+        for phase_name, duration in sorted(self.phases, key=lambda phase: phase[1], reverse=True):
+            lines.append(f"{phase_name:<20}{duration * 1e3:>12.1f}")
+        lines.append(f"{'total':<20}{sum(duration for _, duration in self.phases) * 1e3:>12.1f}")
+        return "\n".join(lines)
+
+
 def create_sound_engine(app):
+    from PySide6 import QtCore as qtc
+    import generictools.personalized_widgets as pwi
+
     sound_engine = pwi.SoundEngine()
     sound_engine_thread = qtc.QThread()
     sound_engine_thread.setObjectName("sound_engine")  # so diagnostics name the thread
@@ -68,7 +99,8 @@ def create_sound_engine(app):
     # app.aboutToQuit.connect(sound_engine.release_all)
     app.aboutToQuit.connect(sound_engine_thread.quit)  # for clean exit; wait() happens after app.exec()
 
-    sound_engine_thread.start(priority=qtc.QThread.HighPriority)
+    # highest scheduling priority, so beeps don't wait behind GUI work
+    sound_engine_thread.start(priority=qtc.QThread.TimeCriticalPriority)
 
     return sound_engine, sound_engine_thread
 
@@ -81,26 +113,57 @@ def setup_logging(level: str="warning", args=None):
 
     log_filename = Path.home().joinpath(f".{APP_DEFINITIONS['app_name'].lower()}.log")
 
-    file_handler = logging.FileHandler(filename=log_filename)
-    stdout_handler = logging.StreamHandler(stream=sys.stdout)
-    handlers = [file_handler, stdout_handler]
-
-    logging.basicConfig(handlers=handlers,
+    handlers = [BufferedFileHandler(filename=log_filename)]  # flushes in batches, errors right away
+
+    # The console is slow to write to (especially on Windows) and usually nobody is
+    # looking at it when the app is launched from a shortcut. Echo there only when
+    # it is a terminal or when debugging. A frozen GUI build has no stdout at all.
+    debugging = bool(args and args.loglevel == "debug")
+    if sys.stdout is not None and (debugging or sys.stdout.isatty()):
+        handlers.append(logging.StreamHandler(stream=sys.stdout))
+
+    # Logging calls only put the record in a queue. The handlers above do the
+    # writing on the listener's own thread, so the GUI thread doesn't wait for
+    # the disk. Stopping the listener at exit writes out the remaining records.
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers,
+                                              respect_handler_level=True,
+                                              )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # Thread and process details are not in the format below, so don't collect
+    # them for each record. funcName is kept, the log is read with it.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    # the queue handler formats the records, the handlers above write them as they are
+    logging.basicConfig(handlers=[logging.handlers.QueueHandler(log_queue)],
                         level=log_level,
                         format="%(asctime)s %(levelname)s - %(funcName)s: %(message)s",
                         force=True,
                         )
     # had to force this
     # https://stackoverflow.com/questions/30861524/logging-basicconfig-not-creating-log-file-when-i-run-in-pycharm
-    logger = logging.getLogger()
     logger.info(f"{time.strftime('%c')} - Started logging with log level {log_level}.")
 
-    return logger
-
 
 def main():
+    startup_timer = StartupTimer()
     args = parse_args(APP_DEFINITIONS)
-    logger = setup_logging(args=args)
+    startup_timer.mark("parse_args")
+    setup_logging(args=args)
+    startup_timer.mark("setup_logging")
+
+    from PySide6 import QtWidgets as qtw
+    from PySide6 import QtCore as qtc
+    from PySide6 import QtGui as qtg
+    import generictools.personalized_widgets as pwi
+    import utils.file_io as fio
+    from config.app_config import singleton_settings
+    from gui.main_window import MainWindow
+    startup_timer.mark("imports")
 
     # ---- Start QApplication
     if not (app := qtw.QApplication.instance()):
@@ -109,32 +172,57 @@ def main():
         # app.setQuitOnLastWindowClosed(True)  # is this necessary??
         icon_path = str(get_main_dir().joinpath(APP_DEFINITIONS["icon_path"]))
         app.setWindowIcon(qtg.QIcon(icon_path))
+    startup_timer.mark("QApplication")
 
     app_settings = singleton_settings()
-    wires = fio.read_wire_table(get_main_dir().joinpath(app_settings.get_value("vc_table_file")))
+    startup_timer.mark("settings")
+
+    # the wire table is read the first time a window winds coils, not up front
+    @functools.cache
+    def get_wires():
+        return fio.read_wire_table(get_main_dir().joinpath(app_settings.get_value("vc_table_file")))
 
     # ---- Catch exceptions and handle with pop-up widget
-    error_handler = pwi.ErrorHandler(logger, developer=False)
-    sys.excepthook = error_handler.excepthook
+    # the handler is built when the first exception arrives, most sessions never need it
+    @functools.cache
+    def get_error_handler():
+        return pwi.ErrorHandler(logger, developer=False)
+
+    def excepthook(*exc_info):
+        get_error_handler().excepthook(*exc_info)
+
+    sys.excepthook = excepthook
 
     # ---- Create sound engine
     sound_engine, sound_engine_thread = create_sound_engine(app)
+    startup_timer.mark("sound_engine")
 
     # ---- Create main window
-    windows = []  # if you don't store them they get garbage collected once new_window terminates
+    windows = set()  # if you don't store them they get garbage collected once new_window terminates
 
     def new_window(**kwargs):
-        mw = MainWindow(sound_engine, wires, **kwargs)
-        windows.append(mw)  # needs to be addressed otherwise it gets deleted from memory.
-        mw.signal_new_window.connect(lambda kwargs: new_window(**kwargs))
+        mw = MainWindow(sound_engine, get_wires, **kwargs)
+        windows.add(mw)  # needs to be addressed otherwise it gets deleted from memory.
+        # a closed window is deleted and forgotten, instead of staying in memory until exit
+        mw.setAttribute(qtc.Qt.WA_DeleteOnClose)
+        mw.destroyed.connect(lambda: windows.discard(mw))
+        mw.signal_new_window.connect(new_window_from_signal)
         mw.show()
         return mw
 
+    def new_window_from_signal(kwargs: dict):
+        # signal_new_window carries the keyword arguments as a dict
+        return new_window(**kwargs)
+
     if args.infile:
-        logger.info(f"Starting application with argument infile: {args.infile}")
+        logger.info("Starting application with argument infile: %s", args.infile)
         mw = new_window(open_user_file=args.infile)
     else:
         new_window()
+    startup_timer.mark("first_window")
+
+    if args.profile_startup and sys.stdout is not None:
+        print(startup_timer.report())
 
     # construct_SpeakerSystem(windows[0])  # for testing
     app.exec()
@@ -146,6 +234,11 @@ def main():
     sound_engine_thread.quit()
     sound_engine_thread.wait()
 
+    # main() may run again in this process with the same QApplication (e.g. from
+    # a REPL). Don't leave this run's connection on it to be called again and
+    # again, the next run connects its own sound engine thread.
+    app.aboutToQuit.disconnect(sound_engine_thread.quit)
+
 
 if __name__ == "__main__":
     main()
@@ -27,7 +27,8 @@ files_to_include = [
     (str(ROOT / "LICENSE"), "LICENSE"),
     (str(ROOT / "README.md"), "README.md"),
     (str(ROOT / APP_DEFINITIONS["icon_path"]), APP_DEFINITIONS["icon_path"]),
-    *[(str(file), str(file.relative_to(ROOT))) for file in (ROOT / "data").rglob("*")],
+    # *.pkl are local caches (e.g. of the wire table), rebuilt by the app when missing
+    *[(str(file), str(file.relative_to(ROOT))) for file in (ROOT / "data").rglob("*") if file.suffix != ".pkl"],
     ]
 
 # sounddevice/soundfile ship their PortAudio/libsndfile binaries in package data
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+from utils.file_io import read_wire_table
+from utils.version_convert import convert_any
+
+DATA_DIR = Path(__file__).parents[1].joinpath("data")
+
+
+@pytest.fixture
+def wire_table_file(tmp_path) -> Path:
+    "A copy of the bundled wire table, so that its cache is written next to it in a temporary folder."
+    wire_table_file = tmp_path.joinpath("wire_table.ods")
+    wire_table_file.write_bytes(DATA_DIR.joinpath("wire_table.ods").read_bytes())
+    return wire_table_file
+
+
+@pytest.fixture(scope="session")
+def wires(tmp_path_factory) -> dict:
+    "Wires read once from a copy of the bundled wire table."
+    wire_table_file = tmp_path_factory.mktemp("data").joinpath("wire_table.ods")
+    wire_table_file.write_bytes(DATA_DIR.joinpath("wire_table.ods").read_bytes())
+    return read_wire_table(wire_table_file)
+
+
+@pytest.fixture
+def startup_vals() -> dict:
+    "A fresh copy of the user form values in the bundled startup file."
+    return convert_any(DATA_DIR.joinpath("startup.sscf"))
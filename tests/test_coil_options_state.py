@@ -0,0 +1,25 @@
+import dataclasses
+
+from core.coil_winding import find_feasible_coils
+from utils.file_io import read_wire_table
+
+
+def state_with_coil_option(vals: dict, wires: dict) -> dict:
+    "The user form state as the main window collects it after a coil search."
+    name, motor = next(iter(find_feasible_coils(vals, wires).items()))
+    return {**vals, "coil_options": {"current_text": name,
+                                     "current_data": dataclasses.asdict(motor),
+                                     }}
+
+
+def test_consecutive_states_compare_equal(wire_table_file, startup_vals):
+    # the second read comes from the pickle cache, with its own float objects
+    wires_first = read_wire_table(wire_table_file)
+    wires_second = read_wire_table(wire_table_file)
+    assert wire_table_file.with_suffix(".pkl").is_file()
+
+    assert state_with_coil_option(startup_vals, wires_first) == state_with_coil_option(startup_vals, wires_second)
+
+
+def test_wire_notes_are_strings(wires):
+    assert all(isinstance(wire.notes, str) for wire in wires.values())
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from core import coil_winding
+from core.coil_winding import find_feasible_coils, wind_coil, _MAX_COIL_OPTIONS
+from core.components import Motor
+from core.speaker_driver import SpeakerDriver
+
+
+def find_feasible_coils_brute_force(vals, wires):
+    "Reference search: wind every wire for every layer option, as before the array prefilter."
+    layer_options = [int(s.strip()) for s in vals["N_layer_options"].split(",") if s.strip()]
+    speaker_options = []
+    for n_layers in layer_options:
+        for wire in wires.values():
+            try:
+                coil = wind_coil(wire=wire,
+                                 n_layers=n_layers,
+                                 w_stacking_coef=vals["w_stacking_coef"],
+                                 carrier_od=vals["former_ID"] + 2 * vals["t_former"],
+                                 h_winding_target=vals["h_winding_target"],
+                                 reduce_per_layer=vals["reduce_per_layer"],
+                                 )
+            except ValueError:
+                continue
+            if vals["target_Re"] / 1.15 < coil.Re < vals["target_Re"] * 1.2:
+                motor = Motor(coil=coil,
+                              Bavg=vals["B_average"],
+                              h_top_plate=vals["h_top_plate"],
+                              t_former=vals["t_former"],
+                              airgap_clearance_inner=vals["airgap_clearance_inner"],
+                              airgap_clearance_outer=vals["airgap_clearance_outer"],
+                              h_former_under_coil=vals["h_former_under_coil"],
+                              )
+                speaker_options.append(SpeakerDriver(fs=vals["fs"],
+                                                     Sd=vals["Sd"],
+                                                     Qms=vals["Qms"],
+                                                     motor=motor,
+                                                     dead_mass=vals["dead_mass"],
+                                                     Rlw=vals["Rlw"],
+                                                     ))
+    speaker_options.sort(key=lambda x: x.Lm(), reverse=True)
+    name_to_motor = {}
+    for speaker in speaker_options[:_MAX_COIL_OPTIONS]:
+        name = f"{speaker.motor.coil.name} -> Re={speaker.Re:.2f}, Lm={speaker.Lm():.2f}, Qts={speaker.Qts:.2f}"
+        name_to_motor[name] = speaker.motor
+    return name_to_motor
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_brute_force_search(wires, startup_vals, seed):
+    rng = random.Random(seed)
+    vals = startup_vals
+    vals.update(target_Re=rng.uniform(1, 16),
+                h_winding_target=rng.uniform(3e-3, 15e-3),
+                former_ID=rng.uniform(10e-3, 50e-3),
+                w_stacking_coef=rng.uniform(0.8, 1),
+                reduce_per_layer=rng.choice((0, 1)),
+                N_layer_options=", ".join(str(n) for n in sorted(rng.sample(range(1, 7), 3))),
+                )
+
+    found = find_feasible_coils(vals, wires)
+    assert found  # the random inputs should land somewhere in the table
+    assert list(found.items()) == list(find_feasible_coils_brute_force(vals, wires).items())
+
+
+def test_matches_brute_force_search_beyond_option_limit(wires, startup_vals):
+    vals = startup_vals
+    vals.update(target_Re=4, h_winding_target=5e-3, N_layer_options=", ".join(str(n) for n in range(1, 13)))
+
+    found = find_feasible_coils(vals, wires)
+    assert len(found) == _MAX_COIL_OPTIONS
+    assert list(found.items()) == list(find_feasible_coils_brute_force(vals, wires).items())
+
+
+def test_kept_option_below_the_limit_is_added_last(wires, startup_vals, monkeypatch):
+    vals = startup_vals
+    vals.update(target_Re=4, h_winding_target=5e-3, N_layer_options=", ".join(str(n) for n in range(1, 13)))
+    best = find_feasible_coils(vals, wires)
+    best_coils = [motor.coil.get_wire_name_and_layers() for motor in best.values()]
+
+    with monkeypatch.context() as patch:
+        patch.setattr(coil_winding, "_MAX_COIL_OPTIONS", 1000)
+        all_coils = [motor.coil.get_wire_name_and_layers() for motor in find_feasible_coils(vals, wires).values()]
+    ranked_out = [coil for coil in all_coils if coil not in best_coils]
+    assert ranked_out
+
+    found = find_feasible_coils(vals, wires, keep=ranked_out[-1])
+    assert list(found)[:-1] == list(best)
+    assert list(found.values())[-1].coil.get_wire_name_and_layers() == ranked_out[-1]
+
+    # nothing is added for an option that is among the best already, or isn't feasible at all
+    assert list(find_feasible_coils(vals, wires, keep=best_coils[-1])) == list(best)
+    assert list(find_feasible_coils(vals, wires, keep=(None, None))) == list(best)
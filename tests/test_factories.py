@@ -0,0 +1,66 @@
+import copy
+import dataclasses
+import logging
+
+import pytest
+
+from core.coil_winding import find_feasible_coils
+from core.factories import _motor_from_dict, construct_SpeakerDriver
+
+
+@pytest.fixture
+def motor(wires, startup_vals):
+    return next(iter(find_feasible_coils(startup_vals, wires).values()))
+
+
+def test_motor_round_trip(motor):
+    assert _motor_from_dict(dataclasses.asdict(motor)) == motor
+
+
+def test_motor_dict_is_not_modified(motor):
+    motor_as_dict = dataclasses.asdict(motor)
+    unchanged = copy.deepcopy(motor_as_dict)
+    _motor_from_dict(motor_as_dict)
+    assert motor_as_dict == unchanged
+
+
+def test_unknown_keys_are_ignored_with_warning(motor, caplog):
+    motor_as_dict = dataclasses.asdict(motor)
+    motor_as_dict["from_a_newer_version"] = 1
+    motor_as_dict["coil"]["from_a_newer_version"] = 1
+    motor_as_dict["coil"]["wire"]["from_a_newer_version"] = 1
+    with caplog.at_level(logging.WARNING):
+        assert _motor_from_dict(motor_as_dict) == motor
+    assert [record.getMessage() for record in caplog.records] == [
+        f"Ignoring unknown {cls_name} value 'from_a_newer_version' in motor data."
+        for cls_name in ("Wire", "Coil", "Motor")
+        ]
+
+
+def test_known_keys_give_no_warning(motor, caplog):
+    with caplog.at_level(logging.WARNING):
+        _motor_from_dict(dataclasses.asdict(motor))
+    assert not caplog.records
+
+
+def test_invalid_coil_option_raises_chained_error(startup_vals, caplog):
+    vals = startup_vals
+    vals["coil_options"] = {**vals["coil_options"], "current_data": None}
+    with pytest.raises(RuntimeError) as exc_info:
+        construct_SpeakerDriver(vals)
+    assert isinstance(exc_info.value.__cause__, TypeError)
+    assert "Could not build the motor" in caplog.text
+
+
+def test_missing_optional_key_takes_default(motor):
+    # as in data saved before the field existed
+    motor_as_dict = dataclasses.asdict(motor)
+    del motor_as_dict["h_former_under_coil"]
+    assert _motor_from_dict(motor_as_dict).h_former_under_coil is None
+
+
+def test_missing_required_keys_raise(motor):
+    motor_as_dict = dataclasses.asdict(motor)
+    del motor_as_dict["coil"]["wire"]["name"]
+    with pytest.raises(TypeError):
+        _motor_from_dict(motor_as_dict)
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+import utils.file_io as fio
+
+
+@pytest.fixture
+def spreadsheet_reads(monkeypatch):
+    "Count the reads of the spreadsheet itself, as opposed to the cache."
+    reads = []
+    import_wire_table = fio._import_wire_table
+
+    def counting_import_wire_table(wire_table_file):
+        reads.append(wire_table_file)
+        return import_wire_table(wire_table_file)
+
+    monkeypatch.setattr(fio, "_import_wire_table", counting_import_wire_table)
+    return reads
+
+
+def test_cache_is_written_and_reused(wire_table_file, spreadsheet_reads):
+    wires = fio.read_wire_table(wire_table_file)
+    assert wire_table_file.with_suffix(".pkl").is_file()
+    assert fio.read_wire_table(wire_table_file) == wires
+    assert len(spreadsheet_reads) == 1
+
+
+def test_cache_older_than_spreadsheet_is_not_used(wire_table_file, spreadsheet_reads):
+    fio.read_wire_table(wire_table_file)
+    cache_mtime = wire_table_file.with_suffix(".pkl").stat().st_mtime
+    os.utime(wire_table_file, (cache_mtime + 10, cache_mtime + 10))
+
+    fio.read_wire_table(wire_table_file)
+    assert len(spreadsheet_reads) == 2
+
+
+def test_cache_for_other_wire_fields_is_not_used(wire_table_file, spreadsheet_reads, monkeypatch):
+    wire_cache_key = fio._WIRE_CACHE_KEY
+    monkeypatch.setattr(fio, "_WIRE_CACHE_KEY", (1, ("name",)))
+    fio.read_wire_table(wire_table_file)
+    monkeypatch.setattr(fio, "_WIRE_CACHE_KEY", wire_cache_key)
+
+    wires = fio.read_wire_table(wire_table_file)
+    assert len(spreadsheet_reads) == 2
+    assert fio.read_wire_table(wire_table_file) == wires  # cache rewritten with the current key
+    assert len(spreadsheet_reads) == 2
+
+
+def test_unreadable_cache_falls_back_to_spreadsheet(wire_table_file, caplog):
+    wires = fio.read_wire_table(wire_table_file)
+    wire_table_file.with_suffix(".pkl").write_bytes(b"not a pickle")
+
+    assert fio.read_wire_table(wire_table_file) == wires
+    assert "Ignoring unreadable wire table cache" in caplog.text
+
+
+def test_missing_spreadsheet(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        fio.read_wire_table(tmp_path.joinpath("wire_table.ods"))
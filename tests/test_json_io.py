@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+import pytest
+
+from core.components import Enclosure
+from utils import json_io
+
+STATE = {"Vb": 1e-05,
+         "user_title": "Ünibox",
+         "items": [["Closed box", 1], ("PR", 2)],
+         "enclosure": Enclosure(1e-3, 200),  # Ql is inf
+         "curve": np.array([1.5, np.nan]),
+         "excitation_value": np.float64(2.83),
+         "N_layers": np.int32(2),
+         "missing": float("nan"),
+         "flag": True,
+         "nothing": None,
+         }
+
+EXPECTED = {"Vb": 1e-05,
+            "user_title": "Ünibox",
+            "items": [["Closed box", 1], ["PR", 2]],
+            "enclosure": {"Vb": 1e-3, "Qa": 200, "Ql": None},
+            "curve": [1.5, None],
+            "excitation_value": 2.83,
+            "N_layers": 2,
+            "missing": None,
+            "flag": True,
+            "nothing": None,
+            }
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_io, "orjson", None)
+    return request.param
+
+
+def test_round_trip(encoder):
+    assert json_io.loads(json_io.dumps(STATE)) == EXPECTED
+
+
+def test_non_finite_floats_written_as_null(encoder):
+    assert b"NaN" not in json_io.dumps(STATE)
+    assert b"Infinity" not in json_io.dumps(STATE)
+
+
+def test_both_encoders_write_the_same_values(monkeypatch):
+    pytest.importorskip("orjson")
+    with_orjson = json_io.dumps(STATE)
+    monkeypatch.setattr(json_io, "orjson", None)
+    with_stdlib = json_io.dumps(STATE)
+    assert json_io.loads(with_orjson) == json_io.loads(with_stdlib)
+    assert len(with_orjson.splitlines()) == len(with_stdlib.splitlines())
+
+
+def test_older_files_with_nan_literals_load(encoder):
+    state = json_io.loads(b'{"Vb": NaN, "Ql": Infinity}')
+    assert math.isnan(state["Vb"]) and math.isinf(state["Ql"])
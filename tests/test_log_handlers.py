@@ -0,0 +1,53 @@
+import logging
+
+import pytest
+
+from utils.log_handlers import BufferedFileHandler
+
+
+@pytest.fixture
+def log_file_and_logger(tmp_path):
+    log_file = tmp_path.joinpath("test.log")
+    # long interval, so the flusher thread doesn't write during the test
+    handler = BufferedFileHandler(log_file, flush_interval=3600)
+    logger = logging.getLogger(f"{__name__}.{tmp_path.name}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    yield log_file, logger
+    logger.removeHandler(handler)
+    handler.close()
+
+
+def test_records_below_error_stay_in_buffer(log_file_and_logger):
+    log_file, logger = log_file_and_logger
+    logger.info("buffered")
+    assert log_file.read_text() == ""
+
+
+def test_error_flushes_buffer(log_file_and_logger):
+    log_file, logger = log_file_and_logger
+    logger.info("buffered")
+    logger.error("flushed")
+    assert log_file.read_text().splitlines() == ["buffered", "flushed"]
+
+
+def test_close_flushes_buffer(tmp_path):
+    log_file = tmp_path.joinpath("test.log")
+    handler = BufferedFileHandler(log_file, flush_interval=3600)
+    handler.emit(logging.LogRecord("test", logging.INFO, __file__, 0, "on close", None, None))
+    handler.close()
+    assert log_file.read_text() == "on close\n"
+    handler._flusher.join(timeout=1)
+    assert not handler._flusher.is_alive()
+
+
+def test_flusher_writes_periodically(tmp_path):
+    log_file = tmp_path.joinpath("test.log")
+    handler = BufferedFileHandler(log_file, flush_interval=0.01)
+    try:
+        handler.emit(logging.LogRecord("test", logging.INFO, __file__, 0, "periodic", None, None))
+        handler._flusher.join(timeout=0.2)  # keeps running, returns on timeout
+        assert log_file.read_text() == "periodic\n"
+    finally:
+        handler.close()
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from core.components import Enclosure
+from core.speaker_driver import SpeakerDriver
+from core.speaker_system import SpeakerSystem
+
+
+@pytest.fixture
+def speaker():
+    return SpeakerDriver(111, 53.5e-4, 6.51, Bl=4.78, Re=4.18, Mms=5.09e-3)
+
+
+@pytest.fixture
+def freqs():
+    return np.geomspace(10, 3000, 200)
+
+
+def test_responses_scale_with_voltage(speaker, freqs):
+    system = SpeakerSystem(speaker, enclosure=Enclosure(1e-3, 200))
+    x_1V = system.get_displacements(1, freqs)
+    x_2V = system.get_displacements(2, freqs)
+    for key in x_1V:
+        np.testing.assert_allclose(x_2V[key], 2 * x_1V[key])
+
+
+def test_update_values_resets_cached_responses(speaker, freqs):
+    system = SpeakerSystem(speaker, enclosure=Enclosure(1e-3, 200))
+    system.get_Z(freqs)  # fills the response cache for these freqs
+
+    system.update_values(speaker=speaker, Rext=1, enclosure=Enclosure(5e-3, 20))
+    fresh_system = SpeakerSystem(speaker, Rext=1, enclosure=Enclosure(5e-3, 20))
+    for updated, fresh in zip(system.get_Z(freqs).values(), fresh_system.get_Z(freqs).values()):
+        np.testing.assert_allclose(updated, fresh)
+    for updated, fresh in zip(system.get_velocities(1, freqs).values(), fresh_system.get_velocities(1, freqs).values()):
+        np.testing.assert_allclose(updated, fresh)
+
+
+def test_new_freqs_array_is_calculated_again(speaker, freqs):
+    system = SpeakerSystem(speaker, enclosure=Enclosure(1e-3, 200))
+    system.get_displacements(1, freqs)
+    other_freqs = np.geomspace(20, 2000, 50)
+    x = system.get_displacements(1, other_freqs)
+    assert all(len(val) == len(other_freqs) for val in x.values())
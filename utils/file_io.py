@@ -16,32 +16,78 @@ __email__ = "kbasaran@gmail.com"
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import dataclasses
+import logging
+import pickle
 from pathlib import Path
 from core.components import Wire
 import pandas as pd
 
+logger = logging.getLogger(__name__)
 
+# Stored with the cached Wire objects, a cache with another key is not used.
+# Holds the fields of Wire, plus a number to raise when the values put in the
+# Wire objects change without a change in their fields.
+_WIRE_CACHE_KEY = (2, tuple(field.name for field in dataclasses.fields(Wire)))
 
-def read_wire_table(wire_table_file: Path) -> pd.DataFrame:
-    if not wire_table_file.exists():
-        raise FileNotFoundError(f"Wire table file not found: {wire_table_file}")
 
+def _import_wire_table(wire_table_file: Path) -> pd.DataFrame:
+    "Read the wire table spreadsheet and convert its values to SI units."
     imported_wire_table = pd.read_excel(wire_table_file, "Sheet1", skiprows=range(2), index_col=0)
-    coeff_for_SI = {
+    coeff_for_SI = pd.Series({
         "nominal_size": 1e-6,
         "w_avg": 1e-6,
         "h_avg": 1e-6,
         "w_max": 1e-6,
-        "nominal_size": 1e-6,
         "mass_density": 1e-3,
-    }
-    for key, coeff in coeff_for_SI.items():
-        imported_wire_table[key] = coeff * imported_wire_table[key]
+    })
+    # all columns in one operation
+    imported_wire_table[coeff_for_SI.index] = imported_wire_table[coeff_for_SI.index].mul(coeff_for_SI, axis=1)
+    # Empty cells are read as NaN. The notes end up in the user form state (coil options),
+    # where a NaN would make two identical states compare unequal (NaN != NaN).
+    imported_wire_table["notes"] = imported_wire_table["notes"].fillna("").astype(str)
+    return imported_wire_table
+
+
+def _wires_from_table(imported_wire_table: pd.DataFrame) -> dict[str, Wire]:
+    "Make a Wire object from each row of the imported wire table."
     if not imported_wire_table.index.is_unique:
         raise IndexError("Wire names in the imported table are not unique.")
 
+    # plain tuples per row, instead of the Series that iterrows builds for each
+    column_names = imported_wire_table.columns.tolist()
     wires_as_dict = dict()
-    for wire_name, columns_data_as_series in imported_wire_table.iterrows():
-        wires_as_dict[wire_name] = Wire(name=wire_name, **columns_data_as_series.to_dict())
+    for wire_name, *row_values in imported_wire_table.itertuples(index=True, name=None):
+        wires_as_dict[wire_name] = Wire(name=wire_name, **dict(zip(column_names, row_values)))
+
+    return wires_as_dict
+
+
+def read_wire_table(wire_table_file: Path) -> dict[str, Wire]:
+    if not wire_table_file.exists():
+        raise FileNotFoundError(f"Wire table file not found: {wire_table_file}")
+
+    # Parsing the spreadsheet is slow, so the finished Wire objects are pickled next to it
+    # and reused for as long as the spreadsheet is not modified.
+    # A cache made for another version of Wire (see _WIRE_CACHE_KEY) is not used.
+    # The cache is optional: any problem reading or writing it falls back to the spreadsheet.
+    cache_file = wire_table_file.with_suffix(".pkl")
+    try:
+        if cache_file.stat().st_mtime >= wire_table_file.stat().st_mtime:
+            with open(cache_file, "rb") as f:
+                cache_key, wires_as_dict = pickle.load(f)
+            if cache_key == _WIRE_CACHE_KEY:
+                return wires_as_dict
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Ignoring unreadable wire table cache '%s': %s", cache_file, e)
+
+    wires_as_dict = _wires_from_table(_import_wire_table(wire_table_file))
+    try:
+        with open(cache_file, "wb") as f:
+            pickle.dump((_WIRE_CACHE_KEY, wires_as_dict), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        logger.warning("Could not write wire table cache '%s': %s", cache_file, e)
 
-    return wires_as_dict
\ No newline at end of file
+    return wires_as_dict
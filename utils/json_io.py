@@ -0,0 +1,68 @@
+"""JSON encoding and decoding for session files.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths work on bytes and write the same layout and values (floats
+may be spelled differently, e.g. 1e-05 and 0.00001), so callers and the saved
+files don't depend on which one is active. NaN and infinity are not valid JSON,
+both paths write them as null, which is read back as None.
+"""
+
+import dataclasses
+import json
+import math
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """Convert types that the encoders don't handle natively."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "tolist"):  # numpy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _to_json_types(obj):
+    """Copy of obj made of the types the standard library encoder writes like orjson does.
+
+    Non-finite floats become None, as orjson writes them as null.
+    """
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, (str, int, type(None))):  # bool is an int
+        return obj
+    if isinstance(obj, dict):
+        return {key: _to_json_types(val) for key, val in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_json_types(val) for val in obj]
+    return _to_json_types(_default(obj))
+
+
+def dumps(obj) -> bytes:
+    """Serialize obj to indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj,
+                            default=_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                            )
+    # same layout as orjson's output, 2-space indent is also quicker to write than 4
+    return json.dumps(_to_json_types(obj), indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes):
+    """Parse JSON bytes.
+
+    orjson rejects the non-standard NaN/Infinity literals that the standard
+    library used to write, and older session files contain them. Such files
+    are parsed again with the standard library.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
@@ -0,0 +1,59 @@
+import logging
+import threading
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that collects records in a large write buffer.
+
+    logging.FileHandler flushes the file after every record, which makes one
+    write call per log line. This handler leaves the flushing to a background
+    thread that runs every flush_interval seconds, so records reach the disk in
+    batches. Records of level ERROR and above are flushed immediately, so that
+    they are on disk even if the application dies right after.
+    """
+
+    def __init__(self, filename, mode="a", encoding="utf-8",
+                 buffer_size: int = 64 * 1024,
+                 flush_interval: float = 1.0,
+                 ):
+        self.buffer_size = buffer_size  # used by _open, which the parent's init calls
+        super().__init__(filename, mode=mode, encoding=encoding)
+
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically,
+                                         args=(flush_interval,),
+                                         name="log_file_flusher",
+                                         daemon=True,
+                                         )
+        self._flusher.start()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode,
+                    buffering=self.buffer_size,
+                    encoding=self.encoding,
+                    errors=self.errors,
+                    )
+
+    def _flush_periodically(self, interval: float):
+        while not self._stop_flushing.wait(interval):
+            self.flush()
+
+    def emit(self, record):
+        # same as logging.FileHandler.emit, without its flush after every record
+        if self.stream is None:
+            if self.mode != "w" or not self._closed:
+                self.stream = self._open()
+        if self.stream is None:
+            return
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self._stop_flushing.set()
+        super().close()  # flushes what is left in the buffer
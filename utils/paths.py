@@ -1,7 +1,9 @@
 import sys
+import functools
 from pathlib import Path
 
 
+@functools.cache  # the answer doesn't change while the application runs
 def get_main_dir():
     if getattr(sys, 'frozen', False):
         # The application is frozen
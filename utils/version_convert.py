@@ -23,6 +23,8 @@ import pathlib
 import inspect
 import json
 
+from utils import json_io
+
 # the v01 files have many custom classes pickled and to unpickle them is often not possible
 # in a system where API of these objects and the Python environment is of newer version and
 # no more compatible [face palm]
@@ -71,8 +73,7 @@ def detect_version(file: Path) -> str:
     # UnicodeDecodeError for the usual binary pickle protocols, or a
     # JSONDecodeError for an ASCII (protocol 0) pickle.
     try:
-        with open(file, "r", encoding="utf-8") as f:
-            state = json.load(f)
+        state = json_io.loads(file.read_bytes())
     except (UnicodeDecodeError, json.JSONDecodeError):
         return "0.1"
 
@@ -192,8 +193,7 @@ def convert_any(file: Path) -> dict:
     if version == "0.1":
         state = convert_v01_to_v02(file)   # unpickle -> v0.2-schema dict
     else:
-        with open(file, "r", encoding="utf-8") as f:
-            state = json.load(f)
+        state = json_io.loads(file.read_bytes())
 
     # Bring every pre-0.4 format up to the current (v0.4) schema. v0.1 has already
     # been lifted to the v0.2 schema above, and v0.2/v0.3 share one schema, so the